@@ -6,7 +6,11 @@ Core resume parsing utilities.
 - Extract contact, skills, education, experience
 """
 
+import copy
+import hashlib
+import os
 import re
+import threading
 from typing import List, Dict, Any
 try:
     import fitz  # PyMuPDF
@@ -31,10 +35,22 @@ except Exception:
     PhraseMatcher = None
     SPACY_AVAILABLE = False
 
-# Load spaCy model at import time (user must ensure it's installed)
+try:
+    import ahocorasick  # pyahocorasick (optional, fastest skills matching)
+    AHOCORASICK_AVAILABLE = True
+except Exception:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+# Load spaCy model at import time (user must ensure it's installed).
+# Only the tokenizer and vocab are used (PhraseMatcher on LOWER), so the
+# statistical components are not loaded at all.
 try:
     if SPACY_AVAILABLE:
-        nlp = spacy.load("en_core_web_sm")
+        nlp = spacy.load(
+            "en_core_web_sm",
+            exclude=["tok2vec", "tagger", "parser", "ner", "lemmatizer", "attribute_ruler", "senter"],
+        )
     else:
         nlp = None
 except Exception:
@@ -42,6 +58,19 @@ except Exception:
     # but spaCy-dependent features will fail until user downloads the model.
     nlp = None
 
+# Batch size used when several resumes are tokenized in one pipe() call
+DEFAULT_BATCH_SIZE = 32
+
+
+def _batch_size() -> int:
+    # Read SMART_RESUME_BATCH per call; a bad value falls back to the default
+    # instead of breaking import of this module.
+    try:
+        size = int(os.getenv("SMART_RESUME_BATCH", DEFAULT_BATCH_SIZE))
+    except ValueError:
+        return DEFAULT_BATCH_SIZE
+    return size if size > 0 else DEFAULT_BATCH_SIZE
+
 
 # ---------- Text extraction ----------
 def extract_text_from_pdf(path: str) -> str:
@@ -50,11 +79,18 @@ def extract_text_from_pdf(path: str) -> str:
             "PyMuPDF (`fitz`) is not installed in this Python environment.\n"
             "Install it in your virtualenv with: `.\\.venv\\Scripts\\python -m pip install pymupdf`"
         )
+    # The "text" default flags, minus ligature preservation (so "fi" becomes
+    # plain letters for keyword matching). TEXTFLAGS_TEXT only exists in newer
+    # PyMuPDF; older releases default to ligatures + whitespace.
+    default_flags = getattr(
+        fitz, "TEXTFLAGS_TEXT", fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE
+    )
+    flags = default_flags & ~fitz.TEXT_PRESERVE_LIGATURES
     doc = fitz.open(path)
-    text_chunks = []
-    for page in doc:
-        text_chunks.append(page.get_text("text"))
-    return "\n".join(text_chunks)
+    try:
+        return "\n".join(page.get_text("text", flags=flags) for page in doc)
+    finally:
+        doc.close()
 
 
 def extract_text_from_docx(path: str) -> str:
@@ -69,60 +105,83 @@ def extract_text_from_docx(path: str) -> str:
 
 
 # ---------- Cleaning ----------
+# Single translate() pass: carriage returns become newlines and weird control
+# chars (everything below 0x20 except \t and \n) are dropped.
+_CLEAN_TABLE = str.maketrans(
+    {"\r": "\n", **{chr(c): None for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)}}
+)
+_WS_RE = re.compile(r"[ \t]+")
+_NL_RE = re.compile(r"\n{3,}")
+
+
 def clean_text(text: str) -> str:
+    text = text.translate(_CLEAN_TABLE)
     # Normalize whitespace and remove multiple empty lines
-    text = text.replace("\r", "\n")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    # Remove weird control chars
-    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f]+", "", text)
+    text = _WS_RE.sub(" ", text)
+    text = _NL_RE.sub("\n\n", text)
     return text.strip()
 
 
 # ---------- Section splitting ----------
-SECTION_HEADERS = [
-    r"\bexperience\b",
-    r"\bwork experience\b",
-    r"\bprofessional experience\b",
-    r"\beducation\b",
-    r"\bskills\b",
-    r"\btechnical skills\b",
-    r"\bprojects\b",
-    r"\bcertifications\b",
-    r"\babout\b",
-    r"\bsummary\b",
-    r"\bobjective\b",
-]
+# Header keyword -> canonical section name used as the split_sections key
+SECTION_CANONICAL = {
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "education": "education",
+    "skills": "skills",
+    "technical skills": "skills",
+    "projects": "projects",
+    "certifications": "certifications",
+    "about": "summary",
+    "summary": "summary",
+    "objective": "summary",
+}
+SECTION_HEADERS = [rf"\b{h}\b" for h in SECTION_CANONICAL]
+# Matches a whole line containing any header keyword, so one finditer() over
+# the text finds every header without splitting it into lines first.
+# Case folding is ASCII only, so e.g. "SKİLLS" is not a header (as with the
+# old line.lower() search) and every keyword lowercases to a SECTION_CANONICAL key.
+_HEADER_LINE_RE = re.compile(
+    r"^.*?(?:" + "|".join(SECTION_HEADERS) + r").*$",
+    flags=re.IGNORECASE | re.MULTILINE | re.ASCII,
+)
+# All keywords on a header line, so "Skills & Experience" fills both sections
+_HEADER_KEYWORD_RE = re.compile("|".join(SECTION_HEADERS), flags=re.IGNORECASE | re.ASCII)
+# Every other line boundary str.splitlines() recognises, mapped to "\n" so the
+# MULTILINE header regex sees the same lines splitlines() would
+_LINE_BREAK_TABLE = str.maketrans({c: "\n" for c in "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"})
 
 
 def split_sections(text: str) -> Dict[str, str]:
     """
     Splits resume text into sections based on header keywords.
-    Returns dict header_lower -> content.
+    Returns dict canonical_name -> content, where canonical_name is one of the
+    SECTION_CANONICAL values, plus 'top' for text before the first header
+    (or just 'main' when no header is found).
     """
-    lines = text.splitlines()
-    header_idxs = []
-    for i, line in enumerate(lines):
-        norm = line.strip().lower()
-        for hdr in SECTION_HEADERS:
-            if re.search(hdr, norm):
-                header_idxs.append((i, norm))
-                break
-
-    if not header_idxs:
+    lines_text = text.replace("\r\n", "\n").translate(_LINE_BREAK_TABLE)
+    headers = list(_HEADER_LINE_RE.finditer(lines_text))
+
+    if not headers:
         # No clear headers; return everything as 'main'
         return {"main": text}
 
     sections = {}
-    for idx, (line_no, norm) in enumerate(header_idxs):
-        start = line_no + 1
-        end = header_idxs[idx + 1][0] if idx + 1 < len(header_idxs) else len(lines)
-        header = lines[line_no].strip()
-        sections[header.lower()] = "\n".join(lines[start:end]).strip()
+    for idx, m in enumerate(headers):
+        end = headers[idx + 1].start() if idx + 1 < len(headers) else len(lines_text)
+        body = lines_text[m.end():end].strip()
+        names = dict.fromkeys(SECTION_CANONICAL[k.lower()] for k in _HEADER_KEYWORD_RE.findall(m.group()))
+        for name in names:
+            if sections.get(name):
+                # Same kind of section seen again (e.g. "Skills" and "Technical Skills")
+                if body:
+                    sections[name] += "\n\n" + body
+            else:
+                sections[name] = body
 
     # Also include text before first header as 'top'
-    first_header_line = header_idxs[0][0]
-    top_text = "\n".join(lines[:first_header_line]).strip()
+    top_text = lines_text[:headers[0].start()].strip()
     if top_text:
         sections["top"] = top_text
 
@@ -131,30 +190,41 @@ def split_sections(text: str) -> Dict[str, str]:
 
 # ---------- Contact extraction ----------
 EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+# Optional country code, then an area/leading group, then 5-12 digits with at
+# most one separator between each (so at least 7 digits); lookarounds keep it
+# from starting or ending inside a longer token instead of backtracking through
+# overlapping groups. Year ranges ("2015-2018") and numeric dates ("12.05.2019")
+# have the same shape, so they are rejected explicitly.
 PHONE_RE = re.compile(
-    r"(\+?\d{1,3}[-.\s]?)?(\(?\d{2,4}\)?[-.\s]?)?[\d\-.\s]{6,15}"
+    r"(?<!\w)"
+    r"(?!(?:19|20)\d{2}[-.\s]?(?:19|20)\d{2}(?![-.\s]?\d))"
+    r"(?!\d{1,2}[-.]\d{1,2}[-.](?:19|20)\d{2}(?![-.\s]?\d))"
+    r"(?:\+\d{1,3}[-.\s]?)?(?:\(\d{2,4}\)|\d{2,4})(?:[-.\s]?\d){5,12}(?!\w)"
 )
-LINKEDIN_RE = re.compile(r"(https?://)?(www\.)?linkedin\.com/[\w\-/]+")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/[\w\-/]+")
+NONDIGIT_RE = re.compile(r"\D")
 
 
 def extract_contact(text: str) -> Dict[str, Any]:
-    emails = EMAIL_RE.findall(text)
-    phones = PHONE_RE.findall(text)
-    # PHONE_RE returns tuples due to groups; rebuild candidates
+    # dedupe while preserving first-seen order
+    emails = []
+    seen_emails = set()
+    for m in EMAIL_RE.finditer(text):
+        email = m.group()
+        if email not in seen_emails:
+            seen_emails.add(email)
+            emails.append(email)
     phone_candidates = set()
     for m in PHONE_RE.finditer(text):
         candidate = m.group().strip()
         # filter out short numeric fragments
-        digits = re.sub(r"\D", "", candidate)
+        digits = NONDIGIT_RE.sub("", candidate)
         if 7 <= len(digits) <= 15:
             phone_candidates.add(candidate)
-    linkedin = LINKEDIN_RE.findall(text)
-    linkedin_urls = []
-    for m in LINKEDIN_RE.finditer(text):
-        linkedin_urls.append(m.group().strip())
+    linkedin_urls = [m.group() for m in LINKEDIN_RE.finditer(text)]
 
     return {
-        "emails": list(dict.fromkeys(emails)),
+        "emails": emails,
         "phones": list(phone_candidates),
         "linkedin": linkedin_urls,
     }
@@ -169,38 +239,94 @@ DEFAULT_SKILLS = [
     "pytorch", "scikit-learn", "excel", "tableau", "power bi"
 ]
 
+# PhraseMatchers keyed by the skills they were built from, so repeated calls
+# reuse the tokenized patterns instead of rebuilding them per resume.
+_SKILLS_MATCHERS: Dict[tuple, Any] = {}
+
+
+def _get_skills_matcher(skills_list: List[str]):
+    key = tuple(skills_list)
+    matcher = _SKILLS_MATCHERS.get(key)
+    if matcher is None:
+        matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        matcher.add("SKILLS", [nlp.make_doc(s) for s in skills_list])
+        _SKILLS_MATCHERS[key] = matcher
+    return matcher
+
+
+# Aho-Corasick automata keyed the same way; finds every skill in one pass
+_SKILLS_AUTOMATA: Dict[tuple, Any] = {}
+
+
+def _get_skills_automaton(skills_list: List[str]):
+    key = tuple(skills_list)
+    automaton = _SKILLS_AUTOMATA.get(key)
+    if automaton is None:
+        automaton = ahocorasick.Automaton()
+        for s in skills_list:
+            automaton.add_word(s.lower(), s.lower())
+        automaton.make_automaton()
+        _SKILLS_AUTOMATA[key] = automaton
+    return automaton
+
+
+# Build the default matcher once at import time
+if AHOCORASICK_AVAILABLE:
+    _get_skills_automaton(DEFAULT_SKILLS)
+elif nlp is not None:
+    _get_skills_matcher(DEFAULT_SKILLS)
+
+
+def _extract_skills_from_doc(doc, skills_list: List[str] = None) -> List[str]:
+    """
+    Run the skills PhraseMatcher over an already tokenized, lowercased Doc.
+    """
+    if skills_list is None:
+        skills_list = DEFAULT_SKILLS
+    matcher = _get_skills_matcher(skills_list)
+    # doc is built from lowered text, so span text is already lowercase
+    return sorted({doc[start:end].text for _mid, start, end in matcher(doc)})
+
 
 def extract_skills(text: str, skills_list: List[str] = None) -> List[str]:
     if skills_list is None:
         skills_list = DEFAULT_SKILLS
 
+    if not skills_list:
+        return []
+
     text_lower = text.lower()
-    found = set()
 
-    # 1) PhraseMatcher if spaCy available
+    # 1) Aho-Corasick automaton if pyahocorasick available: single pass over the text
+    if AHOCORASICK_AVAILABLE:
+        automaton = _get_skills_automaton(skills_list)
+        found = set()
+        for end, skill in automaton.iter(text_lower):
+            start = end - len(skill) + 1
+            # keep whole-word hits only, like the token-based PhraseMatcher
+            if start > 0 and text_lower[start - 1].isalnum():
+                continue
+            if end + 1 < len(text_lower) and text_lower[end + 1].isalnum():
+                continue
+            found.add(skill)
+        return sorted(found)
+
+    # 2) PhraseMatcher if spaCy available
     if nlp is not None:
-        matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-        patterns = [nlp.make_doc(s) for s in skills_list]
-        matcher.add("SKILLS", patterns)
-        doc = nlp(text_lower)
-        matches = matcher(doc)
-        for _mid, start, end in matches:
-            span = doc[start:end].text
-            found.add(span.lower())
-
-    # 2) fallback: simple substring check
-    for s in skills_list:
-        if s.lower() in text_lower:
-            found.add(s.lower())
+        # PhraseMatcher(attr="LOWER") only needs tokens
+        doc = nlp.make_doc(text_lower)
+        return _extract_skills_from_doc(doc, skills_list)
 
-    return sorted(list(found))
+    # 3) fallback: simple substring check when neither is available
+    return sorted({s.lower() for s in skills_list if s.lower() in text_lower})
 
 
 # ---------- Education extraction ----------
 EDU_KEYWORDS = [
-    "bachelor", "master", "b\.a\.", "b\.sc\.", "m\.sc\.", "phd", "b\.tech", "m\.tech",
+    "bachelor", "master", r"b\.a\.", r"b\.sc\.", r"m\.sc\.", "phd", r"b\.tech", r"m\.tech",
     "bs", "ms", "mba", "associate", "high school", "secondary school"
 ]
+EDU_RE = re.compile("|".join(EDU_KEYWORDS))
 
 
 def extract_education(section_text: str) -> List[Dict[str, str]]:
@@ -211,7 +337,7 @@ def extract_education(section_text: str) -> List[Dict[str, str]]:
     lines = section_text.splitlines()
     for line in lines:
         low = line.lower()
-        if any(re.search(k, low) for k in EDU_KEYWORDS):
+        if EDU_RE.search(low):
             # try extract degree, institution, year
             year_match = re.search(r"(19|20)\d{2}", line)
             year = year_match.group(0) if year_match else ""
@@ -225,9 +351,15 @@ def extract_education(section_text: str) -> List[Dict[str, str]]:
 
 # ---------- Experience extraction ----------
 DATE_RANGE_RE = re.compile(
-    r"((Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|Aug(ust)?|Sep(tember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?)[\w\.\s,-]*\d{4})|((19|20)\d{2})|present",
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[\w\.\s,-]*\d{4}|(?:19|20)\d{2}|present",
     flags=re.IGNORECASE,
 )
+# Cheap literal gate: lines without any year/month/present can't match DATE_RANGE_RE
+_YEAR_OR_MONTH_RE = re.compile(
+    r"(?:19|20)\d{2}|present|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec",
+    flags=re.IGNORECASE,
+)
+_YEAR_OR_PRESENT_RE = re.compile(r"(?:19|20)\d{2}|present", flags=re.IGNORECASE)
 
 
 def parse_experience(section_text: str) -> List[Dict[str, Any]]:
@@ -239,77 +371,42 @@ def parse_experience(section_text: str) -> List[Dict[str, Any]]:
     lines = [l.strip() for l in section_text.splitlines() if l.strip()]
     cur_entry = None
     for line in lines:
+        dates = DATE_RANGE_RE.findall(line) if _YEAR_OR_MONTH_RE.search(line) else []
         # if line contains a date, start a new entry
-        if DATE_RANGE_RE.search(line):
+        if dates:
             # finalize any previous
             if cur_entry:
                 entries.append(cur_entry)
-            # create new
-            cur_entry = {"title_company": line, "dates": DATE_RANGE_RE.findall(line), "details": []}
+            # create new; date_tokens keeps only the year/present matches
+            date_tokens = [d for d in dates if _YEAR_OR_PRESENT_RE.search(d)]
+            cur_entry = {"title_company": line, "dates": dates, "details": [], "date_tokens": date_tokens}
         else:
             # continuation or bulleted details
             if cur_entry is None:
                 # first line without date: treat as title/company
-                cur_entry = {"title_company": line, "dates": [], "details": []}
+                cur_entry = {"title_company": line, "dates": [], "details": [], "date_tokens": []}
             else:
                 cur_entry["details"].append(line)
     if cur_entry:
         entries.append(cur_entry)
-
-    # post-process to simplify dates
-    for e in entries:
-        dates = DATE_RANGE_RE.findall(e["title_company"])
-        # flatten the tuples
-        date_tokens = []
-        for t in dates:
-            for part in t:
-                if isinstance(part, str) and re.search(r"(19|20)\d{2}|present", part, re.IGNORECASE):
-                    date_tokens.append(part)
-        e["date_tokens"] = date_tokens
     return entries
 
 
 # ---------- Top-level parse ----------
-def parse_resume_from_text(text: str) -> Dict[str, Any]:
-    text = clean_text(text)
-    sections = split_sections(text)
-
+def _assemble_parsed(text: str, sections: Dict[str, str], skills: List[str]) -> Dict[str, Any]:
     # Aggregate for contact parsing (use entire text)
     contact = extract_contact(text)
 
-    # Skills: check skills section first, fallback to whole text
-    skills_text = ""
-    for k in sections:
-        if "skill" in k:
-            skills_text = sections[k]
-            break
-    if not skills_text:
-        skills_text = text
-
-    skills = extract_skills(skills_text)
-
     # Education
-    education_section = ""
-    for k in sections:
-        if "educat" in k:
-            education_section = sections[k]
-            break
+    education_section = sections.get("education", "")
     education = extract_education(education_section) if education_section else []
 
     # Experience
-    experience_section = ""
-    for k in sections:
-        if "experi" in k:
-            experience_section = sections[k]
-            break
+    experience_section = sections.get("experience", "")
     experience = parse_experience(experience_section) if experience_section else []
 
     # Summary/objective
-    summary = ""
-    for k in sections:
-        if "summary" in k or "objective" in k:
-            summary = sections[k]
-            break
+    summary = sections.get("summary", "")
     if not summary and "top" in sections:
         # take first 3 lines of top as a probable summary
         summary = "\n".join(sections["top"].splitlines()[:3])
@@ -324,6 +421,62 @@ def parse_resume_from_text(text: str) -> Dict[str, Any]:
     }
 
 
+# Recent parse results keyed by a digest of the raw text, so re-parsing the
+# same resume (Streamlit reruns, debug runs) skips the extraction work.
+# Kept in least-recently-used order: hits move to the end, eviction pops the front.
+_PARSE_CACHE_SIZE = 64
+_PARSE_CACHE: Dict[bytes, Dict[str, Any]] = {}
+# Streamlit serves sessions from several threads; guards lookups and eviction
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def _parse_resume_from_text(text: str) -> Dict[str, Any]:
+    text = clean_text(text)
+    sections = split_sections(text)
+    # Skills: check skills section first, fallback to whole text
+    skills = extract_skills(sections.get("skills") or text)
+    return _assemble_parsed(text, sections, skills)
+
+
+def parse_resume_from_text(text: str) -> Dict[str, Any]:
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _PARSE_CACHE_LOCK:
+        parsed = _PARSE_CACHE.pop(key, None)
+        if parsed is not None:
+            _PARSE_CACHE[key] = parsed
+    if parsed is None:
+        # parse outside the lock so other sessions aren't blocked meanwhile
+        parsed = _parse_resume_from_text(text)
+        with _PARSE_CACHE_LOCK:
+            # another session may have cached the same text meanwhile
+            if key not in _PARSE_CACHE and len(_PARSE_CACHE) >= _PARSE_CACHE_SIZE:
+                # drop the least recently used entry
+                _PARSE_CACHE.pop(next(iter(_PARSE_CACHE)), None)
+            _PARSE_CACHE[key] = parsed
+    # callers may mutate the result, so never hand out the cached object
+    return copy.deepcopy(parsed)
+
+
+def parse_resumes_from_texts(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Parse several resumes at once. Equivalent to calling parse_resume_from_text
+    on each text, but the skills texts are tokenized in batches.
+    """
+    cleaned = [clean_text(t) for t in texts]
+    all_sections = [split_sections(t) for t in cleaned]
+    skills_texts = [s.get("skills") or t for t, s in zip(cleaned, all_sections)]
+
+    if nlp is not None and not AHOCORASICK_AVAILABLE:
+        docs = nlp.tokenizer.pipe([t.lower() for t in skills_texts], batch_size=_batch_size())
+        all_skills = [_extract_skills_from_doc(doc) for doc in docs]
+    else:
+        all_skills = [extract_skills(t) for t in skills_texts]
+
+    return [
+        _assemble_parsed(t, s, k) for t, s, k in zip(cleaned, all_sections, all_skills)
+    ]
+
+
 def parse_resume_file(path: str) -> Dict[str, Any]:
     lpath = path.lower()
     if lpath.endswith(".pdf"):
@@ -349,5 +502,6 @@ __all__ = [
     "extract_education",
     "parse_experience",
     "parse_resume_from_text",
+    "parse_resumes_from_texts",
     "parse_resume_file",
 ]
\ No newline at end of file
@@ -33,6 +33,13 @@ from utils import to_json, parsed_to_dataframe, df_to_csv_bytes
 
 st.set_page_config(page_title="Smart Resume Parser", layout="wide")
 
+
+@st.cache_data(show_spinner=False)
+def parse_text_cached(text):
+    # Streamlit reruns the whole script on every interaction; reuse results for unchanged text
+    return parse_resume_from_text(text)
+
+
 st.title("Smart Resume Parser")
 st.write("Upload a PDF / DOCX / TXT resume. We'll parse and extract structured fields.")
 
@@ -68,7 +75,7 @@ if st.button("Parse"):
 
             # If we have raw_text, parse from it (safer than re-opening file)
             if raw_text:
-                parsed = parse_resume_from_text(raw_text)
+                parsed = parse_text_cached(raw_text)
             else:
                 # fallback to file-based parse
                 parsed = parse_resume_file(tmp_path)
@@ -78,7 +85,7 @@ if st.button("Parse"):
             except Exception:
                 pass
         else:
-            parsed = parse_resume_from_text(sample_text)
+            parsed = parse_text_cached(sample_text)
 
         # Show raw extracted text preview for debugging/troubleshooting
         st.subheader("Raw text preview (first 1200 chars)")
@@ -116,6 +123,7 @@ if st.button("Parse"):
 
         # Show dataframe preview (what will be exported)
         st.subheader("Parsed data table preview")
+        df = None
         try:
             df = parsed_to_dataframe(parsed)
             st.dataframe(df)
@@ -150,7 +158,9 @@ if st.button("Parse"):
 
         # Exports
         st.subheader("Export")
-        df = parsed_to_dataframe(parsed)
+        # Reuse the preview DataFrame; only rebuild if the preview failed
+        if df is None:
+            df = parsed_to_dataframe(parsed)
         csv_bytes = df_to_csv_bytes(df)
         st.download_button("Download JSON", data=json_text, file_name="parsed_resume.json", mime="application/json")
         st.download_button("Download CSV", data=csv_bytes, file_name="parsed_resume.csv", mime="text/csv")
\ No newline at end of file
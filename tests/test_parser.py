@@ -0,0 +1,172 @@
+import threading
+
+import pytest
+
+import parser
+from parser import (
+    clean_text,
+    extract_contact,
+    extract_skills,
+    parse_experience,
+    parse_resume_from_text,
+    parse_resumes_from_texts,
+    split_sections,
+)
+
+SKILLS_TEXT = "Excellent digital communicator; PostgreSQL; reactive systems; Javascript, C++ and scikit-learn"
+
+
+def test_split_sections_breaks_lines_like_splitlines():
+    sections = split_sections("a\nx\u2028Skills\ny")
+    assert sections == {"skills": "y", "top": "a\nx"}
+
+    sections = split_sections("a\r\nEducation\x85BSc, Uni, 2019")
+    assert sections == {"education": "BSc, Uni, 2019", "top": "a"}
+
+
+def test_split_sections_ignores_non_ascii_header_lookalikes():
+    for text in ("x\nSK\u0130LLS\nbody", "x\nexper\u0131ence\nbody", "x\n\u017fkills\nbody"):
+        assert split_sections(text) == {"main": text}
+        assert parse_resume_from_text(text)["raw_sections"] == {"main": text}
+
+    assert split_sections("x\nTECHNICAL SKILLS\nbody") == {"skills": "body", "top": "x"}
+
+
+def test_combined_header_fills_every_named_section():
+    text = "Jane\nSkills & Experience\nDev, Acme, 2019 - 2021\n- python"
+    sections = split_sections(text)
+    assert sections["skills"] == sections["experience"] == "Dev, Acme, 2019 - 2021\n- python"
+
+    parsed = parse_resume_from_text(text)
+    assert parsed["skills"] == ["python"]
+    assert [e["title_company"] for e in parsed["experience"]] == ["Dev, Acme, 2019 - 2021"]
+
+
+def test_bad_batch_size_env_falls_back_to_default(monkeypatch):
+    for value in ("", "abc", "0"):
+        monkeypatch.setenv("SMART_RESUME_BATCH", value)
+        assert parser._batch_size() == parser.DEFAULT_BATCH_SIZE
+        texts = ["Skills\npython", "Education\nBSc, Uni, 2019"]
+        assert parse_resumes_from_texts(texts) == [parse_resume_from_text(t) for t in texts]
+
+    monkeypatch.setenv("SMART_RESUME_BATCH", "8")
+    assert parser._batch_size() == 8
+
+
+def test_automaton_skills_match_whole_words_only(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    monkeypatch.setattr(parser, "AHOCORASICK_AVAILABLE", True)
+    assert extract_skills(SKILLS_TEXT) == ["c++", "javascript", "postgresql", "scikit-learn"]
+
+
+def test_automaton_and_phrase_matcher_agree(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    spacy = pytest.importorskip("spacy")
+    monkeypatch.setattr(parser, "nlp", spacy.blank("en"))
+    monkeypatch.setattr(parser, "_SKILLS_MATCHERS", {})
+
+    monkeypatch.setattr(parser, "AHOCORASICK_AVAILABLE", False)
+    phrase_matcher_skills = extract_skills(SKILLS_TEXT)
+    monkeypatch.setattr(parser, "AHOCORASICK_AVAILABLE", True)
+    assert extract_skills(SKILLS_TEXT) == phrase_matcher_skills
+
+
+def test_parse_cache_is_bounded_and_thread_safe(monkeypatch):
+    monkeypatch.setattr(parser, "_PARSE_CACHE", {})
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(200):
+                parse_resume_from_text(f"Skills\npython {offset + i}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(parser._PARSE_CACHE) <= parser._PARSE_CACHE_SIZE
+
+
+def test_parse_cache_returns_independent_copies():
+    first = parse_resume_from_text("Skills\npython")
+    first["skills"].append("mutated")
+    assert parse_resume_from_text("Skills\npython")["skills"] == ["python"]
+
+
+@pytest.mark.parametrize("phone", [
+    "+1 (555) 123-4567",
+    "+1 555-123-4567",
+    "(555) 123-4567",
+    "555.123.4567",
+    "+44 20 7946 0958",
+    "+91 98765 43210",
+])
+def test_extract_contact_finds_phone_formats(phone):
+    assert extract_contact(f"Call me at {phone} anytime")["phones"] == [phone]
+
+
+@pytest.mark.parametrize("text", [
+    "Experience 2015-2018 and 2019-2020",
+    "Worked 2015 2018",
+    "Graduated 12.05.2019",
+    "Jan 2020 - Present",
+    "Employee ID 12345, PIN 560001",
+    "Invoice INV1234567 and ABC-12345678X",
+])
+def test_extract_contact_ignores_dates_and_ids(text):
+    assert extract_contact(text)["phones"] == []
+
+
+@pytest.mark.parametrize("use_automaton", [False, True])
+def test_skills_added_to_defaults_at_runtime_are_found(monkeypatch, use_automaton):
+    if use_automaton:
+        pytest.importorskip("ahocorasick")
+    monkeypatch.setattr(parser, "AHOCORASICK_AVAILABLE", use_automaton)
+    monkeypatch.setattr(parser, "nlp", None)
+    monkeypatch.setattr(parser, "DEFAULT_SKILLS", list(parser.DEFAULT_SKILLS))
+    parser.DEFAULT_SKILLS.append("rust")
+    assert extract_skills("I write Rust and Python") == ["python", "rust"]
+
+
+def test_parse_cache_keeps_recently_used_entries(monkeypatch):
+    monkeypatch.setattr(parser, "_PARSE_CACHE", {})
+    parse_resume_from_text("Skills\npython")
+    for i in range(parser._PARSE_CACHE_SIZE * 2):
+        parse_resume_from_text(f"Skills\njava {i}")
+        parse_resume_from_text("Skills\npython")  # hit: moves to the end
+
+    calls = []
+    monkeypatch.setattr(parser, "_parse_resume_from_text", lambda text: calls.append(text) or {})
+    parse_resume_from_text("Skills\npython")
+    assert calls == []
+    assert len(parser._PARSE_CACHE) == parser._PARSE_CACHE_SIZE
+
+
+def test_parse_experience_dates_and_tokens():
+    entries = parse_experience("Dev, Acme (Jan 2020 - Present)\n- built things\nOps, Y, 2015-2018")
+    assert entries == [
+        {
+            "title_company": "Dev, Acme (Jan 2020 - Present)",
+            "dates": ["Jan 2020", "Present"],
+            "details": ["- built things"],
+            "date_tokens": ["Jan 2020", "Present"],
+        },
+        {
+            "title_company": "Ops, Y, 2015-2018",
+            "dates": ["2015", "2018"],
+            "details": [],
+            "date_tokens": ["2015", "2018"],
+        },
+    ]
+
+
+def test_clean_text_normalizes_whitespace_and_control_chars():
+    assert clean_text("  John\r\nDoe\t\t Jr\n\n\n\nSkills\x00\x07:\x1f python  ") == "John\n\nDoe Jr\n\nSkills: python"
+    # control chars go before whitespace collapsing, so runs they split still merge
+    assert clean_text("a \x01 b\n\x0c\n\nc") == "a b\n\nc"
+    assert clean_text("keep\ttabs?\u00e9\u2028") == "keep tabs?\u00e9"
@@ -0,0 +1,38 @@
+import json
+import sys
+import types
+
+import utils
+from parser import parse_resume_from_text
+from utils import parsed_to_dataframe, to_json
+
+
+def test_to_json_matches_stdlib_output():
+    parsed = parse_resume_from_text("José Müller\nSkills\nPython, java")
+    assert to_json(parsed) == json.dumps(parsed, indent=2, ensure_ascii=False)
+
+
+def test_to_json_accepts_lone_surrogates():
+    parsed = parse_resume_from_text("Skills\nPython \udc80 java")
+    assert to_json(parsed) == json.dumps(parsed, indent=2, ensure_ascii=False)
+
+
+def test_parsed_to_dataframe_falls_back_without_arrow_strings(monkeypatch):
+    # Stand-in for a pandas whose pyarrow is missing or too old
+    calls = []
+
+    def DataFrame(data, dtype=None, copy=None):
+        calls.append(dtype)
+        if dtype == "string[pyarrow]":
+            raise ImportError("pyarrow>=1.0.0 is required for PyArrow backed StringArray.")
+        return data
+
+    monkeypatch.setitem(sys.modules, "pandas", types.SimpleNamespace(DataFrame=DataFrame))
+    monkeypatch.setattr(utils, "_ARROW_STRINGS", True)
+
+    parsed = parse_resume_from_text("Skills\npython")
+    df = parsed_to_dataframe(parsed)
+    assert df["section"][-1] == "skills" and df["value"][-1] == "python"
+    assert parsed_to_dataframe(parsed) == df
+    # the arrow dtype is only attempted once
+    assert calls == ["string[pyarrow]", None, None]
@@ -3,56 +3,82 @@ Utility helpers for exporting parsed data to JSON/CSV and simple formatting.
 """
 
 import json
-import pandas as pd
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas is imported lazily in parsed_to_dataframe (it is slow to import and the
+# JSON path doesn't need it). Whether this pandas/pyarrow pair can build
+# "string[pyarrow]" columns is only known once we try; cleared on first failure.
+_ARROW_STRINGS = True
+
+try:
+    import orjson  # optional, much faster pretty-printing than stdlib json
+    ORJSON_AVAILABLE = True
+except Exception:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 
 def to_json(parsed: Dict[str, Any]) -> str:
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(parsed, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. lone surrogates from odd extractions, which stdlib json accepts
+            pass
     return json.dumps(parsed, indent=2, ensure_ascii=False)
 
 
-def parsed_to_dataframe(parsed: Dict[str, Any]) -> pd.DataFrame:
+def parsed_to_dataframe(parsed: Dict[str, Any]) -> "pd.DataFrame":
     """
     Flatten parsed object into a simple DataFrame with rows for skills, education, experience.
     """
-    rows = []
+    global _ARROW_STRINGS
+    import pandas as pd
+
+    # Build the three columns directly instead of a list of per-row dicts
+    sections, keys, values = [], [], []
+
+    def add(section, key, value):
+        sections.append(section)
+        keys.append(key)
+        values.append(value)
+
     # contact info row
     contact = parsed.get("contact", {})
-    rows.append({
-        "section": "contact",
-        "key": "emails",
-        "value": ", ".join(contact.get("emails", []))
-    })
-    rows.append({
-        "section": "contact",
-        "key": "phones",
-        "value": ", ".join(contact.get("phones", []))
-    })
-    rows.append({
-        "section": "contact",
-        "key": "linkedin",
-        "value": ", ".join(contact.get("linkedin", []))
-    })
+    add("contact", "emails", ", ".join(contact.get("emails", [])))
+    add("contact", "phones", ", ".join(contact.get("phones", [])))
+    add("contact", "linkedin", ", ".join(contact.get("linkedin", [])))
 
     # summary
-    rows.append({"section": "summary", "key": "summary", "value": parsed.get("summary", "")})
+    add("summary", "summary", parsed.get("summary", ""))
 
     # skills
     for s in parsed.get("skills", []):
-        rows.append({"section": "skills", "key": "skill", "value": s})
+        add("skills", "skill", s)
 
     # education
     for edu in parsed.get("education", []):
-        rows.append({"section": "education", "key": edu.get("degree", ""), "value": f'{edu.get("institution","")} | {edu.get("year","")}'})
+        add("education", edu.get("degree", ""), f'{edu.get("institution","")} | {edu.get("year","")}')
 
     # experience
     for exp in parsed.get("experience", []):
         title = exp.get("title_company", "")
         dates = ", ".join(exp.get("date_tokens", []))
         details = "; ".join(exp.get("details", []))
-        rows.append({"section": "experience", "key": title, "value": f"{dates} | {details}"})
+        add("experience", title, f"{dates} | {details}")
 
-    return pd.DataFrame(rows)
+    columns = {"section": sections, "key": keys, "value": values}
+    # All columns are text; the arrow-backed string dtype is narrower than object
+    if _ARROW_STRINGS:
+        try:
+            return pd.DataFrame(columns, dtype="string[pyarrow]", copy=False)
+        except (ImportError, TypeError):
+            # pyarrow missing/too old, or a pandas without arrow strings
+            _ARROW_STRINGS = False
+    return pd.DataFrame(columns, copy=False)
 
 
 def df_to_csv_bytes(df):